@@ -1,50 +1,301 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, g
 from flask_cors import CORS
+from flask_compress import Compress
 from datetime import datetime, timedelta
-import uuid
+from itertools import chain, islice
+from operator import itemgetter
+from sortedcontainers import SortedKeyList, SortedList
+import heapq
+import math
+import numpy as np
+import orjson
+import secrets
+import threading
 import json
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; _first_fit then runs as plain Python
+    njit = None
+
 app = Flask(__name__)
 CORS(app)
+Compress(app)
+
+# Urgency drifts by about 0.04 points per hour, so a minute-old score is still accurate
+SCORE_REFRESH_SECONDS = 60
+# Status codes for the status column; anything else is stored as OTHER_STATUS
+STATUS_CODES = {'pending': 0, 'in_progress': 1, 'completed': 2}
+OTHER_STATUS = 3
+SUMMARY_KEYS = ('high_priority', 'medium_priority', 'low_priority', 'pending', 'in_progress', 'completed')
+# Task fields returned by list endpoints unless the client asks for others with ?fields=
+DEFAULT_LIST_FIELDS = ('id', 'title', 'priority', 'priority_score', 'scheduled_time', 'status')
+
+def _public(task):
+    """Strip internal cached fields from a task before returning it"""
+    return {k: v for k, v in task.items() if not k.startswith('_')}
+
+def _dumps(data):
+    """Encode JSON with orjson, falling back to json for values it rejects (e.g. ints beyond 64 bits)"""
+    try:
+        return orjson.dumps(data)
+    except orjson.JSONEncodeError:
+        return json.dumps(data, separators=(',', ':')).encode()
+
+def _json(data):
+    """Build a JSON response encoded with orjson"""
+    return app.response_class(_dumps(data), mimetype='application/json')
+
+def _requested_fields():
+    """Task fields requested via ?fields=; None means the full task"""
+    fields = request.args.get('fields')
+    if not fields:
+        return DEFAULT_LIST_FIELDS
+    if fields == 'all':
+        return None
+    return tuple(f for f in (f.strip() for f in fields.split(',')) if f and not f.startswith('_'))
+
+def _project(task, fields):
+    """Public view of a task limited to fields; None keeps every public field"""
+    if fields is None:
+        return _public(task)
+    return {k: task.get(k) for k in fields}
+
+def _task_json(task, fields=None):
+    """Serialized view of a task limited to fields, cached until the task changes"""
+    if fields is not None and fields != DEFAULT_LIST_FIELDS:
+        # Arbitrary client projections are not cached
+        return _dumps(_project(task, fields))
+    
+    cache = task.setdefault('_json', {})
+    if fields not in cache:
+        cache[fields] = _dumps(_project(task, fields))
+    return cache[fields]
+
+def _schedule_json(result, fields=None):
+    """Build a schedule response, splicing in each task's cached JSON"""
+    head = _dumps({k: v for k, v in result.items() if k != 'tasks'})
+    tasks = b','.join(_task_json(t, fields) for t in result['tasks'])
+    return app.response_class(head[:-1] + b',"tasks":[' + tasks + b']}', mimetype='application/json')
+
+def _parse_datetime(value):
+    """Parse an ISO datetime; the scheduler works in naive local time, so offsets are rejected"""
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        raise ValueError(f'datetime must not include a timezone offset: {value}')
+    return dt
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _to_us(dt):
+    """Microseconds since the epoch for a naive datetime"""
+    return (dt - _EPOCH) // _MICROSECOND
+
+def _first_fit(starts, ends, first, now, deadline, duration, step):
+    """Number of steps from now to the first free slot before deadline, or -1
+
+    starts/ends are busy intervals sorted by start; all values share one time unit.
+    """
+    cursor = now
+    for i in range(first, len(starts)):
+        if cursor >= deadline:
+            return -1
+        if starts[i] >= cursor + duration:
+            break
+        if ends[i] > cursor:
+            cursor = now + -(-(ends[i] - now) // step) * step
+    if cursor >= deadline:
+        return -1
+    return (cursor - now) // step
+
+if njit is not None:
+    _first_fit = njit('int64(int64[:], int64[:], int64, int64, int64, int64, int64)', cache=True)(_first_fit)
+
+def _score_arrays(priority, deadline_epoch, duration, now_ts):
+    """Vectorized calculate_priority_score over parallel arrays; keep the two in step"""
+    urgency = np.maximum(0, 10 - (deadline_epoch - now_ts) / 3600 / 24)
+    return np.round(priority * 2 + urgency + np.minimum(duration / 120, 2), 2)
+
+def _validate(task):
+    """Reject field values the scheduler indexes cannot order, count or hash"""
+    for field in ('priority', 'estimated_duration'):
+        value = task[field]
+        if not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f'{field} must be a finite number')
+    if not isinstance(task['status'], str):
+        raise ValueError('status must be a string')
+
+def _tally(counts, task, delta=1):
+    """Add a task's priority and status buckets to summary counts"""
+    priority = task['priority']
+    if priority >= 8:
+        counts['high_priority'] += delta
+    elif priority >= 4:
+        counts['medium_priority'] += delta
+    else:
+        counts['low_priority'] += delta
+    
+    status = task['status']
+    if status in ('pending', 'in_progress', 'completed'):
+        counts[status] += delta
 
 class TaskScheduler:
+    # Per-task numeric columns, row i belongs to self._id_at_index[i]
+    _COLUMNS = ('_priority_arr', '_deadline_epoch_arr', '_duration_arr', '_status_arr')
+    
     def __init__(self):
+        # Active tasks; completed ones move to self._completed so hot paths never see them
         self.tasks = {}
+        self._completed = {}
         self.schedule = []
+        self._lock = threading.RLock()
+        # Bumped on every change to served data; the instance token keeps ETags unique across restarts
+        self._instance = secrets.token_hex(4)
+        self._version = 0
+        # Active (non-completed) tasks as (start, end, task_id), ordered by start
+        self._intervals = SortedList()
+        # Durations of the active intervals, so the longest one is known after removals too
+        self._durations = SortedList()
+        self._interval_us = None
+        # Task ids by status and (priority, task_id) pairs for filtered schedules
+        self._by_status = {}
+        self._by_priority = SortedList()
+        # Summary counts over all tasks, kept up to date on every write
+        self._counts = dict.fromkeys(SUMMARY_KEYS, 0)
+        # All tasks ordered by descending priority score
+        self._sorted = SortedKeyList(key=itemgetter('_sort_key'))
+        self._scored_at = None
+        # Scoring inputs as parallel arrays for vectorized rescoring
+        self._priority_arr = np.zeros(0, dtype=np.float64)
+        self._deadline_epoch_arr = np.zeros(0, dtype=np.float64)
+        self._duration_arr = np.zeros(0, dtype=np.float64)
+        self._status_arr = np.zeros(0, dtype=np.int8)
+        self._id_at_index = []
+        self._index_of = {}
     
-    def calculate_priority_score(self, task):
+    def calculate_priority_score(self, task, now=None):
         """Calculate dynamic priority score"""
-        base_priority = task.get('priority', 5)
-        deadline = datetime.fromisoformat(task.get('deadline', datetime.now().isoformat()))
-        estimated_duration = task.get('estimated_duration', 60)
+        now = now or datetime.now()
+        deadline_epoch = task.get('_deadline_epoch')
+        if deadline_epoch is None:
+            deadline_epoch = _parse_datetime(task.get('deadline', now.isoformat())).timestamp()
+        
+        base_priority = float(task.get('priority', 5))
+        estimated_duration = float(task.get('estimated_duration', 60))
         
-        # Time urgency factor
-        time_until_deadline = (deadline - datetime.now()).total_seconds() / 3600
-        urgency_factor = max(0, 10 - (time_until_deadline / 24))
+        # Time urgency factor, from the same float epochs _score_arrays uses
+        urgency_factor = max(0.0, 10 - (deadline_epoch - now.timestamp()) / 3600 / 24)
         
         # Duration factor (longer tasks get slight boost)
         duration_factor = min(estimated_duration / 120, 2)
         
-        # Calculate final score
+        # Calculate final score, rounding like np.round (scale, round half to even, unscale)
         priority_score = (base_priority * 2) + urgency_factor + duration_factor
         
-        return round(priority_score, 2)
+        return round(priority_score * 100) / 100
+    
+    def _cache_times(self, task, fields=None):
+        """Parse and cache datetimes derived from the given task fields"""
+        if fields is None or 'scheduled_time' in fields or 'estimated_duration' in fields:
+            task['_scheduled_dt'] = _parse_datetime(task['scheduled_time'])
+            task['_end_dt'] = task['_scheduled_dt'] + timedelta(minutes=task['estimated_duration'])
+        if fields is None or 'deadline' in fields:
+            task['_deadline_dt'] = _parse_datetime(task['deadline'])
+            task['_deadline_epoch'] = task['_deadline_dt'].timestamp()
+    
+    def get_task(self, task_id):
+        """Look up a task by id, active or completed"""
+        return self.tasks.get(task_id) or self._completed.get(task_id)
+    
+    def _index_task(self, task_id, task):
+        """Add a task to the indexes, then store it in the active or completed collection"""
+        # Ordered inserts come first: if one raises, the task is not yet stored anywhere
+        active = task.get('status') != 'completed'
+        if active:
+            self._intervals.add((task['_scheduled_dt'], task['_end_dt'], task_id))
+            self._durations.add(task['_end_dt'] - task['_scheduled_dt'])
+            self._interval_us = None
+        self._by_priority.add((task['priority'], task_id))
+        # The id breaks score ties, so removals find their entry by bisection instead of a scan
+        task['_sort_key'] = (-task['priority_score'], task_id)
+        self._sorted.add(task)
+        
+        self._by_status.setdefault(task['status'], set()).add(task_id)
+        self._set_columns(task_id, task)
+        _tally(self._counts, task)
+        if active:
+            self.tasks[task_id] = task
+        else:
+            self._completed[task_id] = task
+        self._version += 1
+    
+    def _set_columns(self, task_id, task):
+        """Write a task's scoring inputs into its column row, appending if new"""
+        i = self._index_of.get(task_id)
+        if i is None:
+            i = len(self._id_at_index)
+            if i == len(self._priority_arr):
+                capacity = max(16, 2 * i)
+                for name in self._COLUMNS:
+                    column = np.zeros(capacity, dtype=getattr(self, name).dtype)
+                    column[:i] = getattr(self, name)
+                    setattr(self, name, column)
+            self._id_at_index.append(task_id)
+            self._index_of[task_id] = i
+        
+        self._priority_arr[i] = task['priority']
+        self._deadline_epoch_arr[i] = task['_deadline_epoch']
+        self._duration_arr[i] = task['estimated_duration']
+        self._status_arr[i] = STATUS_CODES.get(task['status'], OTHER_STATUS)
+    
+    def _remove_columns(self, task_id):
+        """Drop a task's column row by moving the last row into its place"""
+        i = self._index_of.pop(task_id)
+        last = len(self._id_at_index) - 1
+        last_id = self._id_at_index.pop()
+        if i != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[i] = column[last]
+            self._id_at_index[i] = last_id
+            self._index_of[last_id] = i
+    
+    def _unindex_task(self, task_id, task):
+        """Remove a task from its collection, the indexes and summary counts"""
+        if self.tasks.pop(task_id, None) is not None:
+            self._intervals.remove((task['_scheduled_dt'], task['_end_dt'], task_id))
+            self._durations.remove(task['_end_dt'] - task['_scheduled_dt'])
+            self._interval_us = None
+        else:
+            self._completed.pop(task_id)
+        self._by_status[task['status']].discard(task_id)
+        self._by_priority.discard((task['priority'], task_id))
+        self._sorted.discard(task)
+        self._remove_columns(task_id)
+        _tally(self._counts, task, -1)
+        self._version += 1
+    
+    def _earliest_overlapping_start(self, start):
+        """Earliest start an active interval can have and still end after start"""
+        longest = self._durations[-1] if self._durations else timedelta(0)
+        if start - datetime.min <= longest:
+            return datetime.min
+        return start - longest
     
-    def detect_conflicts(self, new_task):
-        """Detect scheduling conflicts"""
+    def detect_conflicts(self, new_start, new_end):
+        """Detect scheduling conflicts with the interval [new_start, new_end)"""
         conflicts = []
-        new_start = datetime.fromisoformat(new_task.get('scheduled_time', datetime.now().isoformat()))
-        new_end = new_start + timedelta(minutes=new_task.get('estimated_duration', 60))
         
-        for task_id, task in self.tasks.items():
-            if task.get('status') == 'completed':
-                continue
-            
-            task_start = datetime.fromisoformat(task.get('scheduled_time', datetime.now().isoformat()))
-            task_end = task_start + timedelta(minutes=task.get('estimated_duration', 60))
-            
+        # Only intervals starting in [new_start - longest duration, new_end) can overlap
+        candidates = self._intervals.irange(
+            (self._earliest_overlapping_start(new_start),), (new_end,), inclusive=(True, False)
+        )
+        
+        for task_start, task_end, task_id in candidates:
             # Check for overlap
-            if (new_start < task_end and new_end > task_start):
+            if task_end > new_start:
+                task = self.tasks[task_id]
                 conflicts.append({
                     'task_id': task_id,
                     'title': task.get('title'),
@@ -53,130 +304,251 @@ class TaskScheduler:
         
         return conflicts
     
-    def suggest_optimal_time(self, task):
+    def detect_conflicts_for_task(self, task, now=None):
+        """Detect scheduling conflicts for a task dict"""
+        now = now or datetime.now()
+        new_start = task.get('_scheduled_dt') or _parse_datetime(task.get('scheduled_time', now.isoformat()))
+        new_end = task.get('_end_dt') or new_start + timedelta(minutes=task.get('estimated_duration', 60))
+        return self.detect_conflicts(new_start, new_end)
+    
+    def _interval_arrays(self):
+        """Active interval starts and ends as microsecond arrays, cached until the index changes"""
+        if self._interval_us is None:
+            n = len(self._intervals)
+            self._interval_us = (
+                np.fromiter((_to_us(start) for start, _, _ in self._intervals), dtype=np.int64, count=n),
+                np.fromiter((_to_us(end) for _, end, _ in self._intervals), dtype=np.int64, count=n)
+            )
+        return self._interval_us
+    
+    def suggest_optimal_time(self, task, now=None):
         """Suggest optimal scheduling time"""
-        duration = task.get('estimated_duration', 60)
-        deadline = datetime.fromisoformat(task.get('deadline', (datetime.now() + timedelta(days=7)).isoformat()))
-        
-        # Start from current time
-        current_time = datetime.now()
-        
-        # Try to find free slot
-        while current_time < deadline:
-            test_task = task.copy()
-            test_task['scheduled_time'] = current_time.isoformat()
+        with self._lock:
+            now = now or datetime.now()
+            duration = timedelta(minutes=task.get('estimated_duration', 60))
+            deadline = task.get('_deadline_dt') or _parse_datetime(task.get('deadline', (now + timedelta(days=7)).isoformat()))
+            step = timedelta(hours=1)
             
-            conflicts = self.detect_conflicts(test_task)
+            # Sweep busy periods from now, jumping to the first hourly slot after each one
+            starts, ends = self._interval_arrays()
+            first = int(np.searchsorted(starts, _to_us(self._earliest_overlapping_start(now))))
+            steps = _first_fit(
+                starts, ends, first, _to_us(now), _to_us(deadline), duration // _MICROSECOND, step // _MICROSECOND
+            )
             
-            if not conflicts:
+            if steps >= 0:
                 return {
-                    'suggested_time': current_time.isoformat(),
+                    'suggested_time': (now + step * int(steps)).isoformat(),
                     'reason': 'No conflicts detected',
                     'confidence': 95
                 }
             
-            # Move to next hour
-            current_time += timedelta(hours=1)
-        
-        return {
-            'suggested_time': current_time.isoformat(),
-            'reason': 'Best available slot near deadline',
-            'confidence': 60
-        }
+            # First hourly slot at or past the deadline
+            current_time = now + step * max(0, -(-(deadline - now) // step))
+            return {
+                'suggested_time': current_time.isoformat(),
+                'reason': 'Best available slot near deadline',
+                'confidence': 60
+            }
     
-    def create_task(self, task_data):
+    def create_task(self, task_data, now=None):
         """Create new task"""
-        task_id = str(uuid.uuid4())[:8]
-        
-        # Set defaults
-        task = {
-            'id': task_id,
-            'title': task_data.get('title', 'Untitled Task'),
-            'description': task_data.get('description', ''),
-            'priority': task_data.get('priority', 5),
-            'estimated_duration': task_data.get('estimated_duration', 60),
-            'deadline': task_data.get('deadline', (datetime.now() + timedelta(days=7)).isoformat()),
-            'scheduled_time': task_data.get('scheduled_time', datetime.now().isoformat()),
-            'status': 'pending',
-            'created_at': datetime.now().isoformat(),
-            'tags': task_data.get('tags', [])
-        }
-        
-        # Calculate priority score
-        task['priority_score'] = self.calculate_priority_score(task)
-        
-        # Check for conflicts
-        conflicts = self.detect_conflicts(task)
-        
-        # Store task
-        self.tasks[task_id] = task
-        
-        result = {
-            'task': task,
-            'conflicts': conflicts,
-            'has_conflicts': len(conflicts) > 0
+        with self._lock:
+            now = now or datetime.now()
+            task_id = secrets.token_hex(4)
+            while task_id in self.tasks or task_id in self._completed:
+                task_id = secrets.token_hex(4)
+            
+            # Set defaults
+            task = {
+                'id': task_id,
+                'title': task_data.get('title', 'Untitled Task'),
+                'description': task_data.get('description', ''),
+                'priority': task_data.get('priority', 5),
+                'estimated_duration': task_data.get('estimated_duration', 60),
+                'deadline': task_data.get('deadline', (now + timedelta(days=7)).isoformat()),
+                'scheduled_time': task_data.get('scheduled_time', now.isoformat()),
+                'status': 'pending',
+                'created_at': now.isoformat(),
+                'tags': task_data.get('tags', [])
+            }
+            
+            self._cache_times(task)
+            _validate(task)
+            
+            # Calculate priority score
+            task['priority_score'] = self.calculate_priority_score(task, now)
+            
+            # Check for conflicts
+            conflicts = self.detect_conflicts(task['_scheduled_dt'], task['_end_dt'])
+            
+            # Store task
+            self._index_task(task_id, task)
+            
+            result = {
+                'task': _public(task),
+                'conflicts': conflicts,
+                'has_conflicts': len(conflicts) > 0
+            }
+            
+            # Suggest alternative if conflicts exist
+            if conflicts:
+                result['suggestion'] = self.suggest_optimal_time(task, now)
+            
+            return result
+    
+    def _summarize_rows(self, rows):
+        """Summary counts for the given column rows"""
+        p = self._priority_arr[rows]
+        status_counts = np.bincount(self._status_arr[rows], minlength=OTHER_STATUS + 1)
+        return {
+            'high_priority': int((p >= 8).sum()),
+            'medium_priority': int(((p >= 4) & (p < 8)).sum()),
+            'low_priority': int((p < 4).sum()),
+            'pending': int(status_counts[STATUS_CODES['pending']]),
+            'in_progress': int(status_counts[STATUS_CODES['in_progress']]),
+            'completed': int(status_counts[STATUS_CODES['completed']])
         }
-        
-        # Suggest alternative if conflicts exist
-        if conflicts:
-            result['suggestion'] = self.suggest_optimal_time(task)
-        
-        return result
     
-    def get_schedule(self, filters=None):
-        """Get optimized schedule"""
-        tasks_list = list(self.tasks.values())
+    def _refresh_scores(self, now):
+        """Rescore every task with current urgency, at most once per SCORE_REFRESH_SECONDS"""
+        if self._scored_at and 0 <= (now - self._scored_at).total_seconds() < SCORE_REFRESH_SECONDS:
+            return
         
-        # Apply filters
-        if filters:
-            if filters.get('status'):
-                tasks_list = [t for t in tasks_list if t['status'] == filters['status']]
-            if filters.get('priority_min'):
-                tasks_list = [t for t in tasks_list if t['priority'] >= filters['priority_min']]
+        n = len(self._id_at_index)
+        if not n:
+            self._scored_at = now
+            return
         
-        # Sort by priority score
-        tasks_list.sort(key=lambda x: x['priority_score'], reverse=True)
+        scores = _score_arrays(
+            self._priority_arr[:n], self._deadline_epoch_arr[:n], self._duration_arr[:n], now.timestamp()
+        )
+        changed = False
+        for task_id, score in zip(self._id_at_index, scores.tolist()):
+            # Rows follow the task collections exactly, so every row resolves to a stored task
+            t = self.tasks.get(task_id) or self._completed[task_id]
+            if t['priority_score'] != score:
+                t['priority_score'] = score
+                t['_sort_key'] = (-score, task_id)
+                t.pop('_json', None)
+                changed = True
         
-        return {
-            'total_tasks': len(tasks_list),
-            'tasks': tasks_list,
-            'summary': {
-                'high_priority': len([t for t in tasks_list if t['priority'] >= 8]),
-                'medium_priority': len([t for t in tasks_list if 4 <= t['priority'] < 8]),
-                'low_priority': len([t for t in tasks_list if t['priority'] < 4]),
-                'pending': len([t for t in tasks_list if t['status'] == 'pending']),
-                'in_progress': len([t for t in tasks_list if t['status'] == 'in_progress']),
-                'completed': len([t for t in tasks_list if t['status'] == 'completed'])
+        # Scores are sort keys, so rebuild the ordering rather than mutate it in place
+        if changed:
+            self._version += 1
+            self._sorted = SortedKeyList(chain(self.tasks.values(), self._completed.values()), key=self._sorted.key)
+        self._scored_at = now
+    
+    def etag(self, now=None):
+        """Opaque tag that changes whenever the schedule contents change"""
+        with self._lock:
+            self._refresh_scores(now or datetime.now())
+            return f'{self._instance}-{self._version}'
+    
+    def get_schedule(self, filters=None, now=None, limit=None):
+        """Get optimized schedule, top limit tasks if given; tasks are internal dicts, serialize with _schedule_json"""
+        with self._lock:
+            now = now or datetime.now()
+            self._refresh_scores(now)
+            status = filters.get('status') if filters else None
+            priority_min = filters.get('priority_min') if filters else None
+            
+            # Apply filters through the status and priority indexes
+            if status or priority_min:
+                task_ids = None
+                if priority_min:
+                    task_ids = {task_id for _, task_id in self._by_priority.irange((priority_min,))}
+                if status:
+                    matching = self._by_status.get(status, set())
+                    task_ids = matching if task_ids is None else task_ids & matching
+                tasks_list = [self.get_task(task_id) for task_id in task_ids]
+                total = len(tasks_list)
+                if limit and limit < total:
+                    tasks_list = heapq.nlargest(limit, tasks_list, key=itemgetter('priority_score'))
+                else:
+                    tasks_list.sort(key=itemgetter('priority_score'), reverse=True)
+            else:
+                total = len(self._sorted)
+                tasks_list = list(islice(self._sorted, limit or None))
+            
+            if status or priority_min:
+                rows = np.fromiter((self._index_of[task_id] for task_id in task_ids), dtype=np.intp, count=len(task_ids))
+                summary = self._summarize_rows(rows)
+            else:
+                summary = dict(self._counts)
+            
+            return {
+                'total_tasks': total,
+                'tasks': tasks_list,
+                'summary': summary
             }
-        }
     
-    def update_task(self, task_id, updates):
+    def update_task(self, task_id, updates, now=None):
         """Update existing task"""
-        if task_id not in self.tasks:
-            return {'error': 'Task not found'}
-        
-        task = self.tasks[task_id]
-        task.update(updates)
-        
-        # Recalculate priority score
-        task['priority_score'] = self.calculate_priority_score(task)
-        task['updated_at'] = datetime.now().isoformat()
-        
-        return {'task': task, 'message': 'Task updated successfully'}
+        with self._lock:
+            now = now or datetime.now()
+            task = self.get_task(task_id)
+            if task is None:
+                return {'error': 'Task not found'}
+            
+            # Underscore fields are internal caches and indexes, never client data
+            updates = {k: v for k, v in updates.items() if not k.startswith('_')}
+            
+            # Build and check the updated task on a copy, so a bad update leaves the stored task indexed
+            updated = {k: v for k, v in task.items() if k != '_json'}
+            updated.update(updates)
+            self._cache_times(updated, updates)
+            _validate(updated)
+            
+            # Recalculate priority score
+            updated['priority_score'] = self.calculate_priority_score(updated, now)
+            updated['updated_at'] = now.isoformat()
+            
+            self._unindex_task(task_id, task)
+            self._index_task(task_id, updated)
+            
+            return {'task': _public(updated), 'message': 'Task updated successfully'}
     
     def delete_task(self, task_id):
         """Delete task"""
-        if task_id not in self.tasks:
-            return {'error': 'Task not found'}
-        
-        deleted_task = self.tasks.pop(task_id)
-        return {'message': 'Task deleted successfully', 'task': deleted_task}
+        with self._lock:
+            deleted_task = self.get_task(task_id)
+            if deleted_task is None:
+                return {'error': 'Task not found'}
+            
+            self._unindex_task(task_id, deleted_task)
+            return {'message': 'Task deleted successfully', 'task': _public(deleted_task)}
 
 scheduler = TaskScheduler()
 
+@app.before_request
+def capture_now():
+    """Use a single timestamp for everything a request does"""
+    g.now = datetime.now()
+
+def _schedule_response(filters=None):
+    """Serve a schedule, or 304 Not Modified if the client's ETag is still current"""
+    etag = scheduler.etag(g.now)
+    # Flask-Compress appends ':<encoding>' to the ETag of compressed responses
+    client_tags = request.if_none_match.as_set(include_weak=True)
+    if request.if_none_match.star_tag or any(tag.split(':', 1)[0] == etag for tag in client_tags):
+        response = app.response_class(status=304)
+    else:
+        limit = int(request.args.get('limit', 0) or 0)
+        fields = _requested_fields()
+        # Serialize under the lock too, so no write lands between reading a task and caching its JSON
+        with scheduler._lock:
+            result = scheduler.get_schedule(filters, now=g.now, limit=max(limit, 0))
+            response = _schedule_json(result, fields)
+    
+    response.set_etag(etag, weak=True)
+    response.cache_control.private = True
+    response.cache_control.must_revalidate = True
+    return response
+
 @app.route('/')
 def home():
-    return jsonify({
+    return _json({
         'service': 'Intelligent Task Scheduler API',
         'version': '1.0.0',
         'endpoints': {
@@ -193,10 +565,10 @@ def create_task():
     """Create new task"""
     try:
         data = request.get_json()
-        result = scheduler.create_task(data)
-        return jsonify(result), 201
+        result = scheduler.create_task(data, now=g.now)
+        return _json(result), 201
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/tasks', methods=['GET'])
 def list_tasks():
@@ -206,32 +578,34 @@ def list_tasks():
             'status': request.args.get('status'),
             'priority_min': int(request.args.get('priority_min', 0))
         }
-        result = scheduler.get_schedule(filters)
-        return jsonify(result), 200
+        return _schedule_response(filters)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/tasks/<task_id>', methods=['GET'])
 def get_task(task_id):
     """Get specific task"""
     try:
-        if task_id not in scheduler.tasks:
-            return jsonify({'error': 'Task not found'}), 404
-        return jsonify({'task': scheduler.tasks[task_id]}), 200
+        # Other threads add and drop cache keys on the task dict under the lock
+        with scheduler._lock:
+            task = scheduler.get_task(task_id)
+            if task is None:
+                return _json({'error': 'Task not found'}), 404
+            return _json({'task': _public(task)}), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/tasks/<task_id>', methods=['PUT'])
 def update_task(task_id):
     """Update task"""
     try:
         data = request.get_json()
-        result = scheduler.update_task(task_id, data)
+        result = scheduler.update_task(task_id, data, now=g.now)
         if 'error' in result:
-            return jsonify(result), 404
-        return jsonify(result), 200
+            return _json(result), 404
+        return _json(result), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/tasks/<task_id>', methods=['DELETE'])
 def delete_task(task_id):
@@ -239,33 +613,34 @@ def delete_task(task_id):
     try:
         result = scheduler.delete_task(task_id)
         if 'error' in result:
-            return jsonify(result), 404
-        return jsonify(result), 200
+            return _json(result), 404
+        return _json(result), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/schedule', methods=['GET'])
 def get_schedule():
     """Get optimized schedule"""
     try:
-        result = scheduler.get_schedule()
-        return jsonify(result), 200
+        return _schedule_response()
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/suggest', methods=['POST'])
 def suggest_time():
     """Suggest optimal scheduling time"""
     try:
-        data = request.get_json()
-        suggestion = scheduler.suggest_optimal_time(data)
-        return jsonify(suggestion), 200
+        # Underscore fields are the scheduler's own cached values, never client data
+        data = {k: v for k, v in request.get_json().items() if not k.startswith('_')}
+        suggestion = scheduler.suggest_optimal_time(data, now=g.now)
+        return _json(suggestion), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return _json({'error': str(e)}), 500
 
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'healthy', 'service': 'task-scheduler'}), 200
+    return _json({'status': 'healthy', 'service': 'task-scheduler'}), 200
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5002, debug=True)
+    # Local runs only; serve production traffic with gunicorn (see gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=5002, debug=False, threaded=True)
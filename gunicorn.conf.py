@@ -0,0 +1,9 @@
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5002')}"
+
+# The scheduler keeps tasks in process memory, so use one worker and scale with threads
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+keepalive = 5
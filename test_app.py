@@ -0,0 +1,195 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as scheduler_app
+from app import SUMMARY_KEYS, TaskScheduler, _tally
+
+NOW = datetime(2026, 1, 5, 9, 17, 3)
+HOUR = timedelta(hours=1)
+
+BAD_UPDATES = [
+    {'scheduled_time': 'garbage'},
+    {'deadline': 'garbage'},
+    {'priority': 'high'},
+    {'priority': '7'},
+    {'estimated_duration': None},
+    {'status': ['completed']},
+    {'scheduled_time': '2026-01-01T10:00:00+00:00'},
+    {'deadline': '2026-01-01T10:00:00+00:00'},
+]
+
+
+def all_tasks(scheduler):
+    return {**scheduler.tasks, **scheduler._completed}
+
+
+def brute_conflicts(scheduler, start, end):
+    return {
+        task_id for task_id, task in all_tasks(scheduler).items()
+        if task['status'] != 'completed'
+        and task['_scheduled_dt'] < end and task['_end_dt'] > start
+    }
+
+
+def brute_suggestion(scheduler, task, now):
+    """The original hour-by-hour probe from now until the deadline"""
+    duration = timedelta(minutes=task['estimated_duration'])
+    deadline = datetime.fromisoformat(task['deadline'])
+    current_time = now
+    while current_time < deadline:
+        if not brute_conflicts(scheduler, current_time, current_time + duration):
+            return current_time.isoformat(), 95
+        current_time += HOUR
+    return current_time.isoformat(), 60
+
+
+def random_task(rng, now):
+    return {
+        'title': f'task {rng.random():.6f}',
+        'priority': rng.choice([rng.randint(1, 10), round(rng.uniform(0, 10), 1)]),
+        'estimated_duration': rng.randint(10, 300),
+        'scheduled_time': (now + timedelta(minutes=rng.randint(-600, 4000))).isoformat(),
+        'deadline': (now + timedelta(minutes=rng.randint(-600, 9000))).isoformat(),
+    }
+
+
+def random_update(rng, now):
+    return rng.choice([
+        {'priority': rng.randint(1, 10)},
+        {'status': rng.choice(['pending', 'in_progress', 'completed'])},
+        {'status': 'completed'},
+        {'estimated_duration': rng.randint(10, 300)},
+        {'scheduled_time': (now + timedelta(minutes=rng.randint(-600, 4000))).isoformat()},
+        {'deadline': (now + timedelta(minutes=rng.randint(-600, 9000))).isoformat()},
+        {'_end_dt': 'x', 'title': 'renamed'},
+    ])
+
+
+def check_against_reference(scheduler, rng, now):
+    tasks = all_tasks(scheduler)
+    
+    # Columns, sorted order and active collection follow the stored tasks exactly
+    assert set(scheduler._id_at_index) == set(tasks)
+    assert len(scheduler._sorted) == len(tasks)
+    assert all(t['status'] != 'completed' for t in scheduler.tasks.values())
+    assert all(t['status'] == 'completed' for t in scheduler._completed.values())
+    
+    start = now + timedelta(minutes=rng.randint(-600, 4000))
+    end = start + timedelta(minutes=rng.randint(1, 300))
+    found = {c['task_id'] for c in scheduler.detect_conflicts(start, end)}
+    assert found == brute_conflicts(scheduler, start, end)
+    
+    probe = random_task(rng, now)
+    suggestion = scheduler.suggest_optimal_time(probe, now)
+    assert (suggestion['suggested_time'], suggestion['confidence']) == brute_suggestion(scheduler, probe, now)
+    
+    later = now + timedelta(hours=rng.randint(0, 200))
+    # Writes score at their own now; force the throttled refresh so every score is taken at later
+    scheduler._scored_at = None
+    for filters in (None, {'status': 'pending'}, {'priority_min': 5}, {'status': 'completed', 'priority_min': 3}):
+        result = scheduler.get_schedule(filters, now=later)
+        expected = [
+            t for t in tasks.values()
+            if not filters
+            or ((not filters.get('status') or t['status'] == filters['status'])
+                and (not filters.get('priority_min') or t['priority'] >= filters['priority_min']))
+        ]
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        for t in expected:
+            _tally(summary, t)
+        
+        scores = [t['priority_score'] for t in result['tasks']]
+        assert {t['id'] for t in result['tasks']} == {t['id'] for t in expected}
+        assert scores == sorted(scores, reverse=True)
+        assert result['total_tasks'] == len(expected)
+        assert result['summary'] == summary
+        for t in result['tasks']:
+            assert t['priority_score'] == scheduler.calculate_priority_score(t, later)
+        
+        top = scheduler.get_schedule(filters, now=later, limit=3)
+        assert [t['priority_score'] for t in top['tasks']] == scores[:3]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_scheduler_matches_brute_force_reference(seed):
+    rng = random.Random(seed)
+    scheduler = TaskScheduler()
+    ids = []
+    
+    for _ in range(60):
+        action = rng.random()
+        if action < 0.45 or not ids:
+            ids.append(scheduler.create_task(random_task(rng, NOW), now=NOW)['task']['id'])
+        elif action < 0.75:
+            scheduler.update_task(rng.choice(ids), random_update(rng, NOW), now=NOW)
+        elif action < 0.85:
+            task_id = rng.choice(ids)
+            before = dict(scheduler.get_task(task_id))
+            with pytest.raises((ValueError, TypeError)):
+                scheduler.update_task(task_id, rng.choice(BAD_UPDATES), now=NOW)
+            assert scheduler.get_task(task_id) == before
+        else:
+            scheduler.delete_task(ids.pop(rng.randrange(len(ids))))
+        
+        check_against_reference(scheduler, rng, NOW)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(scheduler_app, 'scheduler', TaskScheduler())
+    return scheduler_app.app.test_client()
+
+
+@pytest.mark.parametrize('update', BAD_UPDATES)
+def test_failed_update_keeps_task(client, update):
+    client.post('/tasks', json={'title': 'other'})
+    task_id = client.post('/tasks', json={'title': 'keep me'}).get_json()['task']['id']
+    
+    assert client.put(f'/tasks/{task_id}', json=update).status_code == 500
+    assert client.get(f'/tasks/{task_id}').get_json()['task']['title'] == 'keep me'
+    assert client.get('/schedule').get_json()['total_tasks'] == 2
+    assert client.post('/tasks', json={'title': 'next'}).status_code == 201
+    assert client.delete(f'/tasks/{task_id}').status_code == 200
+    assert client.get('/schedule').get_json()['total_tasks'] == 2
+
+
+def test_update_ignores_internal_fields(client):
+    task_id = client.post('/tasks', json={'title': 'a'}).get_json()['task']['id']
+    
+    assert client.put(f'/tasks/{task_id}', json={'_end_dt': 'x', '_sort_key': 'x'}).status_code == 200
+    assert client.post('/tasks', json={'title': 'b'}).status_code == 201
+    assert client.get('/schedule').get_json()['total_tasks'] == 2
+
+
+def test_long_task_deleted_keeps_conflict_window_in_range(client):
+    client.post('/tasks', json={'title': 'a'})
+    task_id = client.post('/tasks', json={'estimated_duration': 1100000000}).get_json()['task']['id']
+    
+    assert client.delete(f'/tasks/{task_id}').status_code == 200
+    assert client.post('/tasks', json={'title': 'b'}).status_code == 201
+    assert client.post('/suggest', json={}).status_code == 200
+
+
+def test_oversized_integers_still_serialize(client):
+    assert client.post('/tasks', json={'title': 100000000000000000000}).status_code == 201
+    
+    assert client.get('/schedule').get_json()['tasks'][0]['title'] == 100000000000000000000
+    assert client.get('/tasks?fields=all').status_code == 200
+
+
+def test_suggest_ignores_internal_fields(client):
+    response = client.post('/suggest', json={'_deadline_dt': 'x', '_end_dt': 'x'})
+    
+    assert response.status_code == 200
+    assert response.get_json()['confidence'] == 95
+
+
+def test_schedule_etag_short_circuits(client):
+    client.post('/tasks', json={'title': 'a'})
+    etag = client.get('/schedule').headers['ETag']
+    
+    assert client.get('/schedule', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get('/tasks', headers={'If-None-Match': '*'}).status_code == 304
+    assert client.get('/schedule', headers={'If-None-Match': 'W/"stale-1"'}).status_code == 200